@@ -1,34 +1,74 @@
 """FastAPI application entry point."""
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
-from typing import List
+import threading
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, BinaryIO, Iterable, List, Optional, Tuple
 
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+import numpy as np
+from fastapi import FastAPI, File, Form, HTTPException, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import TypeAdapter
 
 from backend.app.models.schemas import (
+    ATTENDANCE_LIST_ADAPTER,
+    STUDENT_LIST_ADAPTER,
     AttendanceRecordResponse,
     RecognitionFace,
     RecognitionResponse,
+    StatsResponse,
     StatusResponse,
     StudentResponse,
 )
 from backend.app.services.mongo_service import get_db_service
-from backend.app.services.recognition_service import FaceRecognitionService
-from backend.app.utils.constants import APP_NAME, APP_VERSION
+from backend.app.utils.constants import (
+    APP_NAME,
+    APP_VERSION,
+    DUPLICATE_STUDENT_MESSAGE,
+    FACE_RECOGNITION,
+)
 from backend.app.utils.helpers import (
+    encoding_to_binary,
     get_current_date,
-    image_bytes_to_bgr,
-    numpy_to_binary,
+    get_utc_now,
+    image_file_to_rgb,
     validate_name,
     validate_student_id,
 )
 
+if TYPE_CHECKING:
+    from backend.app.services.recognition_service import FaceRecognitionService, RecognitionResult
+
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+_db_service = get_db_service()
+_recognition_service: Optional[FaceRecognitionService] = None
+_recognition_lock = threading.Lock()
+_last_upload: Optional[Tuple[bytes, str, List[RecognitionResult]]] = None
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+_live_frame_slots = asyncio.Semaphore(FACE_RECOGNITION.MAX_CONCURRENT_FRAMES)
+
 
-app = FastAPI(title=APP_NAME, version=APP_VERSION)
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    await asyncio.to_thread(_db_service.connect)
+    warm_up = asyncio.get_running_loop().run_in_executor(None, _warm_up)
+    warm_up.add_done_callback(_log_warm_up_failure)
+    try:
+        yield
+    finally:
+        # The executor thread cannot be interrupted, so let it finish before closing the client.
+        await asyncio.wait({warm_up})
+        await asyncio.to_thread(_db_service.close)
+
+
+app = FastAPI(title=APP_NAME, version=APP_VERSION, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -38,13 +78,79 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-_db_service = get_db_service()
-_db_service.connect()
-_recognition_service = FaceRecognitionService()
+
+def _get_recognition_service() -> FaceRecognitionService:
+    """Create the recognition service on first use; importing it loads dlib."""
+    global _recognition_service
+    if _recognition_service is None:
+        with _recognition_lock:
+            if _recognition_service is None:
+                from backend.app.services.recognition_service import FaceRecognitionService
+
+                _recognition_service = FaceRecognitionService()
+    return _recognition_service
+
+
+def _load_known_faces() -> int:
+    return _get_recognition_service().load_known_faces()
+
+
+def _warm_up() -> None:
+    _db_service.migrate_legacy_encodings()
+    _load_known_faces()
+
+
+def _log_warm_up_failure(future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Warm-up failed", exc_info=future.exception())
+
+
+def _upload_digest(image_file: BinaryIO) -> bytes:
+    hasher = hashlib.blake2b(digest_size=16)
+    image_file.seek(0)
+    for chunk in iter(lambda: image_file.read(_UPLOAD_CHUNK_SIZE), b""):
+        hasher.update(chunk)
+    image_file.seek(0)
+    return hasher.digest()
+
+
+def _recognize_image(image_file: BinaryIO) -> List[RecognitionResult]:
+    global _last_upload
+    digest = _upload_digest(image_file)
+    version = _db_service.get_encodings_version()
+    cached = _last_upload
+    if cached is not None and cached[0] == digest and cached[1] == version:
+        return cached[2]
+
+    rgb_frame = image_file_to_rgb(image_file)
+    recognition_service = _get_recognition_service()
+    recognition_service.load_known_faces()
+    results = recognition_service.recognize_rgb(rgb_frame)
+    _last_upload = (digest, version, results)
+    return results
+
+
+def _encode_registration_face(image_file: BinaryIO) -> Optional[np.ndarray]:
+    image_file.seek(0)
+    return _get_recognition_service().encode_primary_rgb(image_file_to_rgb(image_file))
+
+
+def _json_list(adapter: TypeAdapter, docs: Iterable[dict]) -> Response:
+    items = adapter.validate_python(list(docs))
+    return Response(content=adapter.dump_json(items), media_type="application/json")
+
+
+def _store_student(student_doc: dict) -> Tuple[bool, str]:
+    success, message = _db_service.add_student(student_doc)
+    if success:
+        _load_known_faces()
+    return success, message
 
 
 @app.get("/api/health", response_model=StatusResponse)
 def health_check() -> StatusResponse:
+    if not _db_service.ping():
+        raise HTTPException(status_code=503, detail="Database unavailable.")
     return StatusResponse(success=True, message="Service is running")
 
 
@@ -62,50 +168,48 @@ async def register_student(
     if not valid_name:
         raise HTTPException(status_code=400, detail=name_message)
 
-    if _db_service.student_exists(student_id):
-        raise HTTPException(status_code=409, detail="Student ID already exists in the system.")
-
-    image_bytes = await image.read()
-    frame = image_bytes_to_bgr(image_bytes)
-
-    results = _recognition_service.recognize_faces(frame)
-    if not results:
+    try:
+        encoding = await run_in_threadpool(_encode_registration_face, image.file)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if encoding is None:
         raise HTTPException(status_code=400, detail="No face detected in the image.")
 
-    encoding = _recognition_service.encode_faces(frame, [results[0].location])[0]
     student_doc = {
         "student_id": student_id.strip(),
         "name": name.strip(),
-        "face_encoding": numpy_to_binary(encoding),
-        "created_at": __import__("datetime").datetime.utcnow(),
+        "face_encoding": encoding_to_binary(encoding),
+        "created_at": get_utc_now(),
     }
-    success, message = _db_service.add_student(student_doc)
+    success, message = await run_in_threadpool(_store_student, student_doc)
     if not success:
-        raise HTTPException(status_code=500, detail=message)
+        status_code = 409 if message == DUPLICATE_STUDENT_MESSAGE else 500
+        raise HTTPException(status_code=status_code, detail=message)
 
-    _recognition_service.load_known_faces()
     return StatusResponse(success=True, message=message)
 
 
 @app.get("/api/students", response_model=List[StudentResponse])
-def list_students() -> List[StudentResponse]:
-    students = _db_service.get_students()
-    return [
-        StudentResponse(
-            student_id=doc["student_id"],
-            name=doc["name"],
-            created_at=doc.get("created_at"),
-        )
-        for doc in students
-    ]
+def list_students() -> Response:
+    return _json_list(STUDENT_LIST_ADAPTER, _db_service.get_students())
+
+
+@app.get("/api/stats", response_model=StatsResponse)
+def get_stats() -> StatsResponse:
+    summary = _db_service.get_daily_summary(get_current_date())
+    return StatsResponse(
+        total_students=summary["total_students"],
+        present_today=summary["attendance_count"],
+        status_counts=summary["by_status"],
+    )
 
 
 @app.post("/api/recognize", response_model=RecognitionResponse)
 async def recognize_faces(image: UploadFile = File(...)) -> RecognitionResponse:
-    image_bytes = await image.read()
-    frame = image_bytes_to_bgr(image_bytes)
-    _recognition_service.load_known_faces()
-    results = _recognition_service.recognize_faces(frame)
+    try:
+        results = await run_in_threadpool(_recognize_image, image.file)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     response_faces = [
         RecognitionFace(
             student_id=result.student_id,
@@ -121,14 +225,17 @@ async def recognize_faces(image: UploadFile = File(...)) -> RecognitionResponse:
 
 @app.post("/api/attendance/mark", response_model=RecognitionResponse)
 async def recognize_and_mark(image: UploadFile = File(...)) -> RecognitionResponse:
-    image_bytes = await image.read()
-    frame = image_bytes_to_bgr(image_bytes)
-    _recognition_service.load_known_faces()
-    results = _recognition_service.recognize_faces(frame)
+    if _live_frame_slots.locked():
+        raise HTTPException(status_code=503, detail="Recognition is busy; frame skipped.")
+    async with _live_frame_slots:
+        try:
+            results = await run_in_threadpool(_recognize_image, image.file)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    for result in results:
-        if result.is_match and result.student_id:
-            _db_service.mark_attendance(result.student_id, result.name)
+    _db_service.queue_attendance(
+        [(result.student_id, result.name) for result in results if result.is_match and result.student_id]
+    )
 
     response_faces = [
         RecognitionFace(
@@ -150,14 +257,10 @@ def get_attendance(date: str | None = None, start: str | None = None, end: str |
     else:
         records = _db_service.get_attendance_by_date(date or get_current_date())
 
-    return [
-        AttendanceRecordResponse(
-            student_id=doc["student_id"],
-            name=doc["name"],
-            date=doc["date"],
-            time=doc["time"],
-            status=doc["status"],
-            created_at=doc.get("created_at"),
-        )
-        for doc in records
-    ]
+    return _json_list(ATTENDANCE_LIST_ADAPTER, records)
+
+
+@app.get("/api/attendance/recent", response_model=List[AttendanceRecordResponse])
+def get_recent_attendance(limit: int = 10):
+    records = _db_service.get_recent_attendance(get_current_date(), max(1, min(limit, 100)))
+    return _json_list(ATTENDANCE_LIST_ADAPTER, records)
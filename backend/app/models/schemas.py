@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class StudentResponse(BaseModel):
@@ -47,3 +47,15 @@ class StatusResponse(BaseModel):
 
     success: bool
     message: str
+
+
+class StatsResponse(BaseModel):
+    """Dashboard statistics response schema."""
+
+    total_students: int
+    present_today: int
+    status_counts: Dict[str, int] = Field(default_factory=dict)
+
+
+STUDENT_LIST_ADAPTER = TypeAdapter(List[StudentResponse])
+ATTENDANCE_LIST_ADAPTER = TypeAdapter(List[AttendanceRecordResponse])
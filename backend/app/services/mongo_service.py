@@ -2,42 +2,81 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
-from typing import List, Optional, Tuple
+import os
+import tempfile
+import threading
+import time
+import uuid
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
-from pymongo import MongoClient
+import numpy as np
+from bson.codec_options import CodecOptions, TypeRegistry
+from pymongo import MongoClient, UpdateOne
 from pymongo.errors import (
+    BulkWriteError,
     ConnectionFailure,
     DuplicateKeyError,
     PyMongoError,
     ServerSelectionTimeoutError,
 )
 
-from backend.app.utils.constants import DATABASE
-from backend.app.utils.helpers import binary_to_numpy, get_current_date, get_current_time
+from backend.app.utils.constants import DATABASE, DUPLICATE_STUDENT_MESSAGE, FACE_RECOGNITION
+from backend.app.utils.helpers import (
+    FaceEncodingDecoder,
+    binary_to_encoding,
+    binary_to_matrix,
+    encoding_to_binary,
+    get_current_date,
+    get_current_date_time,
+    get_utc_now,
+    is_legacy_array_binary,
+    matrix_to_binary,
+)
 
 
 logger = logging.getLogger(__name__)
 
+EncodingMatrix = Tuple[np.ndarray, List[str], List[str]]
+
+_ENCODINGS_BUNDLE_ID = "bundle"
+_ATTENDANCE_MARKED_MESSAGE = "Attendance marked successfully"
+_ATTENDANCE_DUPLICATE_MESSAGE = "Attendance already marked for today."
+_WRITE_FAILED_MESSAGE = "Database connection failed."
+_ATTENDANCE_PROJECTION = {
+    "student_id": 1,
+    "name": 1,
+    "date": 1,
+    "time": 1,
+    "status": 1,
+    "created_at": 1,
+    "_id": 0,
+}
 
-class MongoDBService:
-    """Singleton MongoDB service for database operations."""
 
-    _instance: Optional["MongoDBService"] = None
+def _empty_encoding_matrix() -> EncodingMatrix:
+    return np.empty((0, FACE_RECOGNITION.ENCODING_SIZE), dtype=np.float32), [], []
 
-    def __new__(cls) -> "MongoDBService":
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+
+def _reencode(binary_data: bytes) -> bytes:
+    return encoding_to_binary(binary_to_encoding(binary_data))
+
+
+class MongoDBService:
+    """MongoDB service for database operations, shared through get_db_service()."""
 
     def __init__(self) -> None:
-        if hasattr(self, "_initialized") and self._initialized:
-            return
         self._client: Optional[MongoClient] = None
         self._db = None
         self._students_collection = None
         self._attendance_collection = None
-        self._initialized = True
+        self._encodings_bundle_collection = None
+        self._students_version = 0
+        self._encodings_cache: Optional[Tuple[str, float, EncodingMatrix]] = None
+        self._marked_today: Tuple[str, Set[str]] = ("", set())
+        self._student_count_cache: Optional[Tuple[int, float, int]] = None
+        self._pending_attendance: Dict[Tuple[str, str], dict] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
 
     def connect(self) -> bool:
         """Connect to MongoDB and initialize collections."""
@@ -46,11 +85,21 @@ class MongoDBService:
                 DATABASE.URI,
                 serverSelectionTimeoutMS=DATABASE.SERVER_SELECTION_TIMEOUT_MS,
                 connectTimeoutMS=DATABASE.CONNECTION_TIMEOUT_MS,
+                socketTimeoutMS=DATABASE.SOCKET_TIMEOUT_MS,
+                maxPoolSize=DATABASE.MAX_POOL_SIZE,
+                minPoolSize=DATABASE.MIN_POOL_SIZE,
+                maxIdleTimeMS=DATABASE.MAX_IDLE_TIME_MS,
+                retryWrites=True,
+                compressors=DATABASE.COMPRESSORS,
             )
             self._client.admin.command("ping")
             self._db = self._client[DATABASE.DATABASE_NAME]
-            self._students_collection = self._db[DATABASE.STUDENTS_COLLECTION]
+            self._students_collection = self._db.get_collection(
+                DATABASE.STUDENTS_COLLECTION,
+                codec_options=CodecOptions(type_registry=TypeRegistry([FaceEncodingDecoder()])),
+            )
             self._attendance_collection = self._db[DATABASE.ATTENDANCE_COLLECTION]
+            self._encodings_bundle_collection = self._db[DATABASE.ENCODINGS_BUNDLE_COLLECTION]
             self._create_indexes()
             return True
         except (ConnectionFailure, ServerSelectionTimeoutError) as exc:
@@ -69,11 +118,20 @@ class MongoDBService:
                 [("student_id", 1), ("date", 1)], unique=True
             )
             self._attendance_collection.create_index("date")
+            self._attendance_collection.create_index([("student_id", 1), ("date", -1)])
+            self._attendance_collection.create_index([("date", 1), ("time", -1)])
+            self._attendance_collection.create_index([("date", 1), ("status", 1)])
         except PyMongoError as exc:
             logger.error("Failed to create indexes: %s", exc)
 
     def is_connected(self) -> bool:
-        """Check if the connection is alive."""
+        """Check from the monitored topology whether any server is reachable."""
+        if self._client is None:
+            return False
+        return self._client.topology_description.has_known_servers
+
+    def ping(self) -> bool:
+        """Round-trip a ping to the server for explicit health checks."""
         if self._client is None:
             return False
         try:
@@ -82,25 +140,43 @@ class MongoDBService:
         except PyMongoError:
             return False
 
+    def close(self) -> None:
+        """Flush buffered attendance and close the client connection pool."""
+        self.flush_attendance()
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
     def add_student(self, student_doc: dict) -> Tuple[bool, str]:
         """Add a new student document."""
         if self._students_collection is None:
             return False, "Database not connected."
         try:
             self._students_collection.insert_one(student_doc)
-            return True, "Student registered successfully"
+            self._students_version += 1
         except DuplicateKeyError:
-            return False, "Student ID already exists in the system."
+            return False, DUPLICATE_STUDENT_MESSAGE
         except PyMongoError as exc:
             logger.error("Failed to add student: %s", exc)
             return False, "Database connection failed."
+        try:
+            version, encodings = self._rebuild_encodings_bundle()
+            self._encodings_cache = (version, time.monotonic(), encodings)
+        except PyMongoError as exc:
+            logger.error("Failed to rebuild face encodings bundle: %s", exc)
+        return True, "Student registered successfully"
 
     def student_exists(self, student_id: str) -> bool:
         """Check if a student ID already exists."""
         if self._students_collection is None:
             return False
         try:
-            return self._students_collection.count_documents({"student_id": student_id}) > 0
+            return (
+                self._students_collection.find_one(
+                    {"student_id": student_id}, projection={"_id": 1}
+                )
+                is not None
+            )
         except PyMongoError:
             return False
 
@@ -114,79 +190,454 @@ class MongoDBService:
             logger.error("Failed to fetch students: %s", exc)
             return []
 
+    def get_student_count(self) -> int:
+        """Return the number of registered students from collection metadata."""
+        if self._students_collection is None:
+            return 0
+        cache = self._student_count_cache
+        now_mono = time.monotonic()
+        if (
+            cache is not None
+            and cache[0] == self._students_version
+            and now_mono - cache[1] < DATABASE.STATS_CACHE_TTL_S
+        ):
+            return cache[2]
+        try:
+            count = self._students_collection.estimated_document_count()
+        except PyMongoError:
+            return 0
+        self._student_count_cache = (self._students_version, now_mono, count)
+        return count
+
+    def migrate_legacy_encodings(self) -> int:
+        """Rewrite pickled face encodings in the raw array format; return how many changed."""
+        if self._db is None:
+            return 0
+        raw_students = self._db[DATABASE.STUDENTS_COLLECTION]
+        try:
+            cursor = raw_students.find(
+                {"face_encoding": {"$exists": True}},
+                projection={"face_encoding": 1},
+                batch_size=DATABASE.CURSOR_BATCH_SIZE,
+            )
+            updates = [
+                UpdateOne(
+                    {"_id": doc["_id"]},
+                    {"$set": {"face_encoding": _reencode(doc["face_encoding"])}},
+                )
+                for doc in cursor
+                if is_legacy_array_binary(doc["face_encoding"])
+            ]
+            if updates:
+                raw_students.bulk_write(updates, ordered=False)
+        except PyMongoError as exc:
+            logger.error("Failed to migrate face encodings: %s", exc)
+            return 0
+        if updates:
+            logger.info("Migrated %d face encodings to the raw array format", len(updates))
+        return len(updates)
+
     def get_all_face_encodings(self) -> List[Tuple[str, str, object]]:
-        """Return all face encodings for recognition."""
+        """Return all face encodings for recognition, cached per bundle version."""
+        matrix, ids, names = self.get_face_encoding_matrix()
+        return list(zip(ids, names, matrix))
+
+    def get_face_encoding_matrix(self) -> EncodingMatrix:
+        """Return all encodings as one float32 matrix with row-aligned ids and names."""
+        return self.get_versioned_encodings()[1]
+
+    def get_encodings_version(self) -> str:
+        """Return the version of the encodings bundle currently served."""
+        return self.get_versioned_encodings()[0]
+
+    def get_versioned_encodings(self) -> Tuple[str, EncodingMatrix]:
+        """Return the encodings with their bundle version, re-checking the version on a TTL."""
         if self._students_collection is None:
-            return []
+            return "", _empty_encoding_matrix()
+        cache = self._encodings_cache
+        now_mono = time.monotonic()
+        if cache is not None and now_mono - cache[1] < DATABASE.ENCODINGS_CHECK_TTL_S:
+            return cache[0], cache[2]
         try:
-            query = {"face_encoding": {"$exists": True}}
-            results = []
-            for doc in self._students_collection.find(query):
-                encoding = binary_to_numpy(doc["face_encoding"])
-                results.append((doc.get("student_id", ""), doc.get("name", ""), encoding))
-            return results
+            version = self._encodings_bundle_version()
+            if cache is not None and version == cache[0]:
+                self._encodings_cache = (version, now_mono, cache[2])
+                return version, cache[2]
+            encodings = self._load_local_encodings(version) if version is not None else None
+            if encodings is None:
+                bundle = self._load_encodings_bundle()
+                if bundle is None:
+                    bundle = self._rebuild_encodings_bundle()
+                version, encodings = bundle
+                self._save_local_encodings(version, encodings)
+            self._encodings_cache = (version, now_mono, encodings)
+            return version, encodings
         except PyMongoError as exc:
             logger.error("Failed to fetch face encodings: %s", exc)
-            return []
+            if cache is not None:
+                return cache[0], cache[2]
+            return "", _empty_encoding_matrix()
+
+    @staticmethod
+    def _load_local_encodings(version: str) -> Optional[EncodingMatrix]:
+        """Read the on-disk encodings copy, or return None unless it matches the bundle version."""
+        try:
+            with np.load(DATABASE.ENCODINGS_CACHE_PATH, allow_pickle=False) as cached:
+                if str(cached["version"]) != version:
+                    return None
+                return (
+                    cached["matrix"].astype(np.float32, copy=False),
+                    cached["ids"].tolist(),
+                    cached["names"].tolist(),
+                )
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, ValueError) as exc:
+            logger.warning("Ignoring unreadable encodings cache: %s", exc)
+            return None
+
+    @staticmethod
+    def _save_local_encodings(version: str, encodings: EncodingMatrix) -> None:
+        matrix, ids, names = encodings
+        cache_path = DATABASE.ENCODINGS_CACHE_PATH
+        temp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                dir=os.path.dirname(cache_path), suffix=".npz", delete=False
+            ) as temp_file:
+                temp_path = temp_file.name
+                np.savez(
+                    temp_file,
+                    matrix=matrix,
+                    ids=np.array(ids, dtype=str),
+                    names=np.array(names, dtype=str),
+                    version=version,
+                )
+            os.replace(temp_path, cache_path)
+        except OSError as exc:
+            logger.warning("Failed to write encodings cache: %s", exc)
+            if temp_path is not None:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+
+    def _encodings_bundle_version(self) -> Optional[str]:
+        """Return the version of the stored bundle, or None if it is missing or stale."""
+        if self._encodings_bundle_collection is None:
+            return None
+        doc = self._encodings_bundle_collection.find_one(
+            {"_id": _ENCODINGS_BUNDLE_ID}, projection={"version": 1, "count": 1}
+        )
+        if doc is None:
+            return None
+        if doc.get("count") != self.get_student_count():
+            # Another worker may have added a student since our count was cached.
+            self._student_count_cache = None
+            if doc.get("count") != self.get_student_count():
+                return None
+        return doc.get("version")
+
+    def _load_encodings_bundle(self) -> Optional[Tuple[str, EncodingMatrix]]:
+        """Decode the stacked encodings bundle, or return None if it is missing or stale."""
+        if self._encodings_bundle_collection is None:
+            return None
+        doc = self._encodings_bundle_collection.find_one({"_id": _ENCODINGS_BUNDLE_ID})
+        if doc is None or "version" not in doc or doc.get("count") != self.get_student_count():
+            return None
+        matrix = binary_to_matrix(doc["matrix"], doc["shape"])
+        return doc["version"], (matrix, doc["ids"], doc["names"])
+
+    def _rebuild_encodings_bundle(self) -> Tuple[str, EncodingMatrix]:
+        """Stack every stored encoding into a newly versioned bundle document."""
+        query = {"face_encoding": {"$exists": True}}
+        projection = {"student_id": 1, "name": 1, "face_encoding": 1, "_id": 0}
+        cursor = self._students_collection.find(
+            query, projection=projection, batch_size=DATABASE.CURSOR_BATCH_SIZE
+        )
+        ids: List[str] = []
+        names: List[str] = []
+        matrix = np.empty(
+            (self.get_student_count(), FACE_RECOGNITION.ENCODING_SIZE), dtype=np.float32
+        )
+        for doc in cursor:
+            row = len(ids)
+            if row == len(matrix):
+                growth = np.empty((max(row, 16), FACE_RECOGNITION.ENCODING_SIZE), dtype=np.float32)
+                matrix = np.concatenate((matrix, growth))
+            matrix[row] = doc["face_encoding"]
+            ids.append(doc.get("student_id", ""))
+            names.append(doc.get("name", ""))
+        matrix = matrix[: len(ids)]
+        version = uuid.uuid4().hex
+        if self._encodings_bundle_collection is not None:
+            self._encodings_bundle_collection.replace_one(
+                {"_id": _ENCODINGS_BUNDLE_ID},
+                {
+                    "_id": _ENCODINGS_BUNDLE_ID,
+                    "version": version,
+                    "count": len(ids),
+                    "ids": ids,
+                    "names": names,
+                    "matrix": matrix_to_binary(matrix),
+                    "shape": list(matrix.shape),
+                },
+                upsert=True,
+            )
+        return version, (matrix, ids, names)
 
     def mark_attendance(self, student_id: str, name: str, status: str = "present") -> Tuple[bool, str]:
         """Insert a new attendance record if not already marked."""
+        return self.mark_attendance_many([(student_id, name)], status)[0]
+
+    def mark_attendance_many(
+        self, students: List[Tuple[str, str]], status: str = "present"
+    ) -> List[Tuple[bool, str]]:
+        """Upsert attendance records for several students in a single bulk write."""
         if self._attendance_collection is None:
-            return False, "Database not connected."
+            return [(False, "Database not connected.")] * len(students)
+        if not students:
+            return []
+
+        today, time_str = get_current_date_time()
+        with self._pending_lock:
+            if self._marked_today[0] != today:
+                self._marked_today = (today, set())
+            marked = self._marked_today[1]
+            pending = [
+                index for index, (student_id, _) in enumerate(students) if student_id not in marked
+            ]
 
-        date_str = get_current_date()
-        time_str = get_current_time()
-        record = {
-            "student_id": student_id,
-            "name": name,
-            "date": date_str,
+        results = [(False, _ATTENDANCE_DUPLICATE_MESSAGE)] * len(students)
+        if not pending:
+            return results
+
+        shared_fields = {
             "time": time_str,
             "status": status,
-            "created_at": datetime.utcnow(),
+            "created_at": get_utc_now(),
         }
+        operations = [
+            UpdateOne(
+                {"student_id": students[index][0], "date": today},
+                {"$setOnInsert": {"name": students[index][1], **shared_fields}},
+                upsert=True,
+            )
+            for index in pending
+        ]
+        failed: Set[int] = set()
         try:
-            self._attendance_collection.insert_one(record)
-            return True, "Attendance marked successfully"
-        except DuplicateKeyError:
-            return False, "Attendance already marked for today."
+            upserted = set(
+                self._attendance_collection.bulk_write(operations, ordered=False).upserted_ids
+            )
+        except BulkWriteError as exc:
+            upserted = {entry["index"] for entry in exc.details.get("upserted", [])}
+            for error in exc.details.get("writeErrors", []):
+                if error.get("code") != 11000:
+                    logger.error("Failed to mark attendance: %s", error.get("errmsg"))
+                    failed.add(error["index"])
         except PyMongoError as exc:
             logger.error("Failed to mark attendance: %s", exc)
-            return False, "Database connection failed."
+            return [(False, _WRITE_FAILED_MESSAGE)] * len(students)
+        stored: List[str] = []
+        for position, index in enumerate(pending):
+            if position in failed:
+                results[index] = (False, _WRITE_FAILED_MESSAGE)
+                continue
+            stored.append(students[index][0])
+            if position in upserted:
+                results[index] = (True, _ATTENDANCE_MARKED_MESSAGE)
+        with self._pending_lock:
+            date_str, marked = self._marked_today
+            if date_str == today:
+                marked.update(stored)
+        return results
+
+    def queue_attendance(self, students: List[Tuple[str, str]], status: str = "present") -> None:
+        """Buffer attendance records for students not yet marked today until the next flush."""
+        if self._attendance_collection is None or not students:
+            return
+        date_str, time_str = get_current_date_time()
+        created_at = get_utc_now()
+        with self._pending_lock:
+            if self._marked_today[0] != date_str:
+                self._marked_today = (date_str, set())
+            marked = self._marked_today[1]
+            for student_id, name in students:
+                key = (student_id, date_str)
+                if student_id in marked or key in self._pending_attendance:
+                    continue
+                self._pending_attendance[key] = {
+                    "student_id": student_id,
+                    "name": name,
+                    "date": date_str,
+                    "time": time_str,
+                    "status": status,
+                    "created_at": created_at,
+                }
+            if self._pending_attendance and self._flush_timer is None:
+                self._flush_timer = threading.Timer(
+                    DATABASE.ATTENDANCE_FLUSH_INTERVAL_S, self.flush_attendance
+                )
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
 
-    def get_attendance_by_date(self, date_str: str) -> List[dict]:
-        """Fetch attendance records by date."""
+    def flush_attendance(self) -> None:
+        """Upsert buffered attendance records in one bulk write and mark the stored ones."""
+        with self._pending_lock:
+            documents = list(self._pending_attendance.values())
+            self._pending_attendance = {}
+            timer = self._flush_timer
+            self._flush_timer = None
+        if timer is not None:
+            timer.cancel()
+        if not documents or self._attendance_collection is None:
+            return
+        failed: Set[int] = set()
+        try:
+            self._attendance_collection.bulk_write(
+                [
+                    UpdateOne(
+                        {"student_id": document["student_id"], "date": document["date"]},
+                        {"$setOnInsert": document},
+                        upsert=True,
+                    )
+                    for document in documents
+                ],
+                ordered=False,
+            )
+        except BulkWriteError as exc:
+            for error in exc.details.get("writeErrors", []):
+                if error.get("code") != 11000:
+                    logger.error("Failed to flush attendance: %s", error.get("errmsg"))
+                    failed.add(error["index"])
+        except PyMongoError as exc:
+            logger.error("Failed to flush attendance: %s", exc)
+            return
+        with self._pending_lock:
+            date_str, marked = self._marked_today
+            marked.update(
+                document["student_id"]
+                for index, document in enumerate(documents)
+                if index not in failed and document["date"] == date_str
+            )
+
+    def get_attendance_by_date(self, date_str: str, limit: int = 0) -> Iterator[dict]:
+        """Stream attendance records for a date."""
         if self._attendance_collection is None:
-            return []
+            return
         try:
-            return list(self._attendance_collection.find({"date": date_str}))
+            cursor = self._attendance_collection.find(
+                {"date": date_str},
+                projection=_ATTENDANCE_PROJECTION,
+                batch_size=DATABASE.CURSOR_BATCH_SIZE,
+                limit=limit,
+            ).hint([("date", 1)])
+            yield from cursor
         except PyMongoError as exc:
             logger.error("Failed to fetch attendance: %s", exc)
-            return []
 
-    def get_attendance_by_range(self, start: str, end: str) -> List[dict]:
-        """Fetch attendance records by date range."""
+    def get_attendance_by_range(self, start: str, end: str, limit: int = 0) -> Iterator[dict]:
+        """Stream attendance records for a date range, newest first."""
         if self._attendance_collection is None:
-            return []
+            return
         try:
             query = {"date": {"$gte": start, "$lte": end}}
-            return list(self._attendance_collection.find(query))
+            cursor = (
+                self._attendance_collection.find(
+                    query,
+                    projection=_ATTENDANCE_PROJECTION,
+                    batch_size=DATABASE.CURSOR_BATCH_SIZE,
+                    limit=limit,
+                )
+                .sort("date", -1)
+                .hint([("date", 1)])
+            )
+            yield from cursor
         except PyMongoError as exc:
             logger.error("Failed to fetch attendance range: %s", exc)
-            return []
+
+    def get_recent_attendance(self, date_str: str, limit: int = 10) -> Iterator[dict]:
+        """Stream the latest attendance records for a date."""
+        if self._attendance_collection is None:
+            return
+        try:
+            cursor = (
+                self._attendance_collection.find(
+                    {"date": date_str},
+                    projection=_ATTENDANCE_PROJECTION,
+                    batch_size=limit,
+                    limit=limit,
+                )
+                .sort("time", -1)
+                .hint([("date", 1), ("time", -1)])
+            )
+            yield from cursor
+        except PyMongoError as exc:
+            logger.error("Failed to fetch recent attendance: %s", exc)
+
+    def get_student_attendance_history(self, student_id: str, limit: int = 30) -> Iterator[dict]:
+        """Stream a student's most recent attendance records."""
+        if self._attendance_collection is None:
+            return
+        try:
+            cursor = (
+                self._attendance_collection.find(
+                    {"student_id": student_id},
+                    projection=_ATTENDANCE_PROJECTION,
+                    batch_size=limit,
+                    limit=limit,
+                )
+                .sort("date", -1)
+                .hint([("student_id", 1), ("date", -1)])
+            )
+            yield from cursor
+        except PyMongoError as exc:
+            logger.error("Failed to fetch attendance history: %s", exc)
+
+    def get_daily_summary(self, date_str: str) -> dict:
+        """Return student and per-status attendance totals for a date in one grouping pass."""
+        summary = {"total_students": self.get_student_count(), "attendance_count": 0, "by_status": {}}
+        if self._attendance_collection is None:
+            return summary
+        try:
+            pipeline = [
+                {"$match": {"date": date_str}},
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+            ]
+            by_status = {
+                entry["_id"]: entry["count"]
+                for entry in self._attendance_collection.aggregate(
+                    pipeline, hint={"date": 1, "status": 1}, allowDiskUse=False
+                )
+            }
+            summary["attendance_count"] = sum(by_status.values())
+            summary["by_status"] = by_status
+        except PyMongoError as exc:
+            logger.error("Failed to aggregate daily summary: %s", exc)
+        return summary
 
     def get_today_attendance_count(self) -> int:
         """Return count of today's attendance records."""
         if self._attendance_collection is None:
             return 0
         try:
-            return self._attendance_collection.count_documents({"date": get_current_date()})
+            return self._attendance_collection.count_documents(
+                {"date": get_current_date()}, hint=[("date", 1)]
+            )
         except PyMongoError:
             return 0
 
 
-_service_instance = MongoDBService()
+_service_instance: Optional[MongoDBService] = None
+_service_lock = threading.Lock()
 
 
 def get_db_service() -> MongoDBService:
     """Return the singleton MongoDB service instance."""
+    global _service_instance
+    if _service_instance is None:
+        with _service_lock:
+            if _service_instance is None:
+                _service_instance = MongoDBService()
     return _service_instance
@@ -1,10 +1,13 @@
 """Face detection and recognition service."""
 from __future__ import annotations
 
+import math
+import threading
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
 import cv2
+import dlib
 import face_recognition
 import numpy as np
 
@@ -12,6 +15,15 @@ from backend.app.services.mongo_service import get_db_service
 from backend.app.utils.constants import FACE_RECOGNITION
 
 
+def _resolve_detection_model(model: str) -> str:
+    if model == "auto":
+        return "cnn" if dlib.DLIB_USE_CUDA else "hog"
+    return model
+
+
+_DETECTION_MODEL = _resolve_detection_model(FACE_RECOGNITION.MODEL)
+
+
 @dataclass
 class RecognitionResult:
     """Recognition result for a single face."""
@@ -28,73 +40,151 @@ class FaceRecognitionService:
 
     def __init__(self) -> None:
         self._tolerance = FACE_RECOGNITION.TOLERANCE
-        self._known_encodings: List[np.ndarray] = []
-        self._known_ids: List[str] = []
-        self._known_names: List[str] = []
+        self._tolerance_squared = self._tolerance * self._tolerance
+        self._known_faces: Tuple[np.ndarray, np.ndarray, List[str], List[str]] = (
+            np.empty((0, FACE_RECOGNITION.ENCODING_SIZE), dtype=np.float32),
+            np.empty(0, dtype=np.float32),
+            [],
+            [],
+        )
+        self._loaded_version: Optional[str] = None
+        self._load_lock = threading.Lock()
 
     def load_known_faces(self) -> int:
-        """Load face encodings from the database."""
+        """Load face encodings from the database if they changed since the last load."""
         service = get_db_service()
-        records = service.get_all_face_encodings()
-        self._known_encodings = []
-        self._known_ids = []
-        self._known_names = []
-        for student_id, name, encoding in records:
-            self._known_encodings.append(encoding)
-            self._known_ids.append(student_id)
-            self._known_names.append(name)
-        return len(self._known_encodings)
+        with self._load_lock:
+            version, (matrix, ids, names) = service.get_versioned_encodings()
+            known_count = len(self._known_faces[2])
+            if self._loaded_version == version and known_count:
+                return known_count
+            matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+            squared_norms = np.einsum("ij,ij->i", matrix, matrix)
+            self._known_faces = (matrix, squared_norms, ids, names)
+            self._loaded_version = version
+            return len(ids)
 
     def detect_faces(self, frame: np.ndarray) -> List[Tuple[int, int, int, int]]:
         """Detect faces in the frame."""
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        locations = face_recognition.face_locations(rgb_frame, model=FACE_RECOGNITION.MODEL)
-        return locations
+        return self._locate_faces(self._to_rgb(frame))
 
     def encode_faces(
         self, frame: np.ndarray, locations: List[Tuple[int, int, int, int]]
     ) -> List[np.ndarray]:
         """Encode faces at the provided locations."""
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        return face_recognition.face_encodings(
-            rgb_frame, known_face_locations=locations, num_jitters=FACE_RECOGNITION.NUM_JITTERS
-        )
+        return self._encode_rgb(self._to_rgb(frame), locations)
 
     def recognize_faces(
         self, frame: np.ndarray
     ) -> List[RecognitionResult]:
         """Detect and recognize faces in a frame."""
-        if not self._known_encodings:
+        return self.recognize_rgb(self._to_rgb(frame))
+
+    def recognize_rgb(self, rgb_frame: np.ndarray) -> List[RecognitionResult]:
+        """Detect and recognize faces in a frame that is already RGB."""
+        if not self._known_faces[2]:
             self.load_known_faces()
 
-        locations = self.detect_faces(frame)
+        locations = self._locate_faces(rgb_frame)
         if not locations:
             return []
 
-        encodings = self.encode_faces(frame, locations)
-        results: List[RecognitionResult] = []
+        encodings = self._encode_rgb(rgb_frame, locations)
+        return self._match_faces(encodings, locations)
 
-        for location, encoding in zip(locations, encodings):
-            results.append(self._match_face(encoding, location))
-        return results
+    def encode_primary_face(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """Detect faces and encode only the first one, for registration."""
+        return self.encode_primary_rgb(self._to_rgb(frame))
 
-    def _match_face(
-        self, encoding: np.ndarray, location: Tuple[int, int, int, int]
-    ) -> RecognitionResult:
-        if not self._known_encodings:
-            return RecognitionResult(None, "Unknown", 0.0, location, False)
-
-        distances = face_recognition.face_distance(self._known_encodings, encoding)
-        best_index = int(np.argmin(distances)) if distances.size > 0 else -1
-
-        if best_index >= 0 and distances[best_index] < self._tolerance:
-            confidence = max(0.0, min(1.0, 1.0 - float(distances[best_index])))
-            return RecognitionResult(
-                self._known_ids[best_index],
-                self._known_names[best_index],
-                confidence,
-                location,
-                True,
+    def encode_primary_rgb(self, rgb_frame: np.ndarray) -> Optional[np.ndarray]:
+        """Encode the first face of a frame that is already RGB."""
+        locations = self._locate_faces(rgb_frame)
+        if not locations:
+            return None
+        return self._encode_rgb(rgb_frame, locations[:1])[0]
+
+    @staticmethod
+    def _detection_frame(rgb_frame: np.ndarray) -> np.ndarray:
+        if _DETECTION_MODEL == "hog":
+            return cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2GRAY)
+        return rgb_frame
+
+    @staticmethod
+    def _to_rgb(frame: np.ndarray) -> np.ndarray:
+        return np.ascontiguousarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), dtype=np.uint8)
+
+    @classmethod
+    def _locate_faces(cls, rgb_frame: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Detect on a copy no wider than DETECTION_MAX_WIDTH; return full-frame boxes."""
+        height, width = rgb_frame.shape[:2]
+        scale = min(1.0, FACE_RECOGNITION.DETECTION_MAX_WIDTH / width)
+        small_frame = rgb_frame
+        small_width, small_height = width, height
+        if scale < 1.0:
+            small_width = max(1, round(width * scale))
+            small_height = max(1, round(height * scale))
+            small_frame = cv2.resize(
+                rgb_frame, (small_width, small_height), interpolation=cv2.INTER_AREA
+            )
+        x_ratio = width / small_width
+        y_ratio = height / small_height
+        min_width = FACE_RECOGNITION.MIN_FACE_SIZE / x_ratio
+        min_height = FACE_RECOGNITION.MIN_FACE_SIZE / y_ratio
+        return [
+            (
+                max(0, int(top * y_ratio)),
+                min(width, int(right * x_ratio)),
+                min(height, int(bottom * y_ratio)),
+                max(0, int(left * x_ratio)),
+            )
+            for top, right, bottom, left in face_recognition.face_locations(
+                cls._detection_frame(small_frame),
+                number_of_times_to_upsample=FACE_RECOGNITION.UPSAMPLE,
+                model=_DETECTION_MODEL,
             )
+            if right - left >= min_width and bottom - top >= min_height
+        ]
+
+    @staticmethod
+    def _encode_rgb(
+        rgb_frame: np.ndarray, locations: List[Tuple[int, int, int, int]]
+    ) -> List[np.ndarray]:
+        return face_recognition.face_encodings(
+            rgb_frame, known_face_locations=locations, num_jitters=FACE_RECOGNITION.NUM_JITTERS
+        )
 
-        return RecognitionResult(None, "Unknown", 0.0, location, False)
+    def _match_faces(
+        self, encodings: List[np.ndarray], locations: List[Tuple[int, int, int, int]]
+    ) -> List[RecognitionResult]:
+        known_matrix, squared_norms, known_ids, known_names = self._known_faces
+        if not known_ids or not encodings:
+            return [
+                RecognitionResult(None, "Unknown", 0.0, location, False)
+                for location in locations[: len(encodings)]
+            ]
+
+        queries = np.asarray(encodings, dtype=np.float32)
+        squared_distances = squared_norms - 2.0 * (queries @ known_matrix.T)
+        best_indices = np.argmin(squared_distances, axis=1)
+        best_squared = squared_distances[np.arange(len(queries)), best_indices]
+        best_squared += np.einsum("ij,ij->i", queries, queries)
+
+        results = []
+        for location, best_index, squared in zip(
+            locations, best_indices.tolist(), best_squared.tolist()
+        ):
+            if squared < self._tolerance_squared:
+                distance = math.sqrt(max(squared, 0.0))
+                confidence = max(0.0, min(1.0, 1.0 - distance))
+                results.append(
+                    RecognitionResult(
+                        known_ids[best_index],
+                        known_names[best_index],
+                        confidence,
+                        location,
+                        True,
+                    )
+                )
+            else:
+                results.append(RecognitionResult(None, "Unknown", 0.0, location, False))
+        return results
@@ -1,11 +1,14 @@
 """Application constants for the web backend."""
 from dataclasses import dataclass
+from pathlib import Path
 
 
 APP_NAME = "Face Recognition Attendance System"
 APP_VERSION = "1.0.0"
 APP_AUTHOR = "Arbab"
 
+DUPLICATE_STUDENT_MESSAGE = "Student ID already exists in the system."
+
 
 @dataclass(frozen=True)
 class DatabaseConfig:
@@ -15,8 +18,19 @@ class DatabaseConfig:
     DATABASE_NAME: str
     STUDENTS_COLLECTION: str
     ATTENDANCE_COLLECTION: str
+    ENCODINGS_BUNDLE_COLLECTION: str
     CONNECTION_TIMEOUT_MS: int
     SERVER_SELECTION_TIMEOUT_MS: int
+    SOCKET_TIMEOUT_MS: int
+    CURSOR_BATCH_SIZE: int
+    STATS_CACHE_TTL_S: float
+    ENCODINGS_CHECK_TTL_S: float
+    ATTENDANCE_FLUSH_INTERVAL_S: float
+    MAX_POOL_SIZE: int
+    MIN_POOL_SIZE: int
+    MAX_IDLE_TIME_MS: int
+    COMPRESSORS: str
+    ENCODINGS_CACHE_PATH: str
 
 
 DATABASE = DatabaseConfig(
@@ -27,8 +41,19 @@ DATABASE = DatabaseConfig(
     DATABASE_NAME="face_attendance",
     STUDENTS_COLLECTION="students",
     ATTENDANCE_COLLECTION="attendance",
+    ENCODINGS_BUNDLE_COLLECTION="face_encodings_bundle",
     CONNECTION_TIMEOUT_MS=5000,
     SERVER_SELECTION_TIMEOUT_MS=5000,
+    SOCKET_TIMEOUT_MS=20000,
+    CURSOR_BATCH_SIZE=500,
+    STATS_CACHE_TTL_S=5.0,
+    ENCODINGS_CHECK_TTL_S=5.0,
+    ATTENDANCE_FLUSH_INTERVAL_S=1.5,
+    MAX_POOL_SIZE=20,
+    MIN_POOL_SIZE=2,
+    MAX_IDLE_TIME_MS=60000,
+    COMPRESSORS="zlib",
+    ENCODINGS_CACHE_PATH=str(Path(__file__).resolve().parents[2] / "face_encodings_cache.npz"),
 )
 
 
@@ -37,18 +62,22 @@ class FaceRecognitionConfig:
     """Face recognition configuration."""
 
     TOLERANCE: float
-    MODEL: str
+    MODEL: str  # "hog", "cnn", or "auto" for "cnn" only when dlib is built with CUDA
+    UPSAMPLE: int
     NUM_JITTERS: int
     ENCODING_SIZE: int
     MIN_FACE_SIZE: int
-    SCALE_FACTOR: float
+    DETECTION_MAX_WIDTH: int
+    MAX_CONCURRENT_FRAMES: int
 
 
 FACE_RECOGNITION = FaceRecognitionConfig(
     TOLERANCE=0.5,
-    MODEL="hog",
+    MODEL="auto",
+    UPSAMPLE=1,
     NUM_JITTERS=1,
     ENCODING_SIZE=128,
     MIN_FACE_SIZE=50,
-    SCALE_FACTOR=0.25,
+    DETECTION_MAX_WIDTH=640,
+    MAX_CONCURRENT_FRAMES=2,
 )
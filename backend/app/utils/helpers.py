@@ -4,41 +4,148 @@ from __future__ import annotations
 import io
 import pickle
 import re
+import struct
+import time
 from datetime import datetime
-from typing import Tuple
+from typing import BinaryIO, Sequence, Tuple, Union
 
 import cv2
 import numpy as np
 from bson import Binary
-from PIL import Image
+from bson.codec_options import TypeDecoder
+
+
+_ARRAY_MAGIC = b"ND"
+_ARRAY_HEADER = struct.Struct("<2sBB")
+_DTYPE_CODES = {np.dtype(np.float16): 0, np.dtype(np.float32): 1, np.dtype(np.float64): 2}
+_CODE_DTYPES = {code: dtype for dtype, code in _DTYPE_CODES.items()}
 
 
 def numpy_to_binary(array: np.ndarray) -> Binary:
     """Convert numpy array to BSON Binary for MongoDB storage."""
-    serialized = pickle.dumps(array, protocol=pickle.HIGHEST_PROTOCOL)
-    return Binary(serialized)
+    array = np.ascontiguousarray(array)
+    code = _DTYPE_CODES.get(array.dtype)
+    if code is None:
+        array = array.astype(np.float32)
+        code = _DTYPE_CODES[array.dtype]
+    header = _ARRAY_HEADER.pack(_ARRAY_MAGIC, code, array.ndim)
+    shape = struct.pack(f"<{array.ndim}I", *array.shape)
+    return Binary(header + shape + array.tobytes())
 
 
 def binary_to_numpy(binary_data: Binary) -> np.ndarray:
     """Convert BSON Binary back to numpy array."""
-    return pickle.loads(binary_data)
+    if is_legacy_array_binary(binary_data):
+        # Encodings stored before the raw format were pickled.
+        return pickle.loads(binary_data)
+    _, code, ndim = _ARRAY_HEADER.unpack_from(binary_data)
+    shape = struct.unpack_from(f"<{ndim}I", binary_data, _ARRAY_HEADER.size)
+    offset = _ARRAY_HEADER.size + 4 * ndim
+    return np.frombuffer(binary_data, dtype=_CODE_DTYPES[code], offset=offset).reshape(shape)
+
+
+def is_legacy_array_binary(binary_data: bytes) -> bool:
+    """Return True if the array was stored with pickle rather than the raw format."""
+    return not binary_data.startswith(_ARRAY_MAGIC)
+
+
+def encoding_to_binary(encoding: np.ndarray) -> Binary:
+    """Serialize a face encoding as float16 to shrink its stored size."""
+    return numpy_to_binary(encoding.astype(np.float16, copy=False))
+
+
+def binary_to_encoding(binary_data: Binary) -> np.ndarray:
+    """Deserialize a stored face encoding as float32 for distance computation."""
+    return binary_to_numpy(binary_data).astype(np.float32, copy=False)
+
+
+class FaceEncodingDecoder(TypeDecoder):
+    """BSON decoder that turns stored face encoding Binaries into float32 arrays."""
+
+    bson_type = bytes
+
+    def transform_bson(self, value: bytes) -> np.ndarray:
+        return binary_to_encoding(value)
+
+
+def matrix_to_binary(matrix: np.ndarray) -> Binary:
+    """Serialize a stacked encoding matrix as contiguous float16 bytes."""
+    return Binary(np.ascontiguousarray(matrix, dtype=np.float16).tobytes())
+
+
+def binary_to_matrix(binary_data: bytes, shape: Sequence[int]) -> np.ndarray:
+    """Rebuild a stacked float16 encoding matrix as float32."""
+    return np.frombuffer(binary_data, dtype=np.float16).reshape(shape).astype(np.float32)
 
 
-def image_bytes_to_bgr(image_bytes: bytes) -> np.ndarray:
+def image_bytes_to_bgr(image_bytes: Union[bytes, memoryview]) -> np.ndarray:
     """Convert raw image bytes to an OpenCV BGR image."""
-    image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-    np_image = np.array(image)
-    return cv2.cvtColor(np_image, cv2.COLOR_RGB2BGR)
+    image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Unsupported or corrupt image data.")
+    return image
+
+
+def image_bytes_to_rgb(image_bytes: Union[bytes, memoryview]) -> np.ndarray:
+    """Convert raw image bytes to a contiguous RGB image."""
+    image = image_bytes_to_bgr(image_bytes)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+
+
+def image_file_to_rgb(image_file: BinaryIO) -> np.ndarray:
+    """Decode an image file object to a contiguous RGB image.
+
+    A BytesIO is decoded straight from its buffer; any other file is read once.
+    """
+    if isinstance(image_file, io.BytesIO):
+        with image_file.getbuffer() as view:
+            return image_bytes_to_rgb(view)
+    image_file.seek(0)
+    return image_bytes_to_rgb(image_file.read())
+
+
+_UTC_NOW_RESOLUTION_S = 0.1
+_cached_utc_now: Tuple[float, datetime] = (float("-inf"), datetime.utcnow())
+
+
+def get_utc_now() -> datetime:
+    """Return the current UTC time, reusing the last reading for up to 100 ms."""
+    global _cached_utc_now
+    read_at, value = _cached_utc_now
+    now_mono = time.monotonic()
+    if now_mono - read_at >= _UTC_NOW_RESOLUTION_S:
+        value = datetime.utcnow()
+        _cached_utc_now = (now_mono, value)
+    return value
+
+
+_cached_date_time: Tuple[int, str, str] = (-1, "", "")
+
+
+def get_current_date_time() -> Tuple[str, str]:
+    """Return current date and time strings, formatted at most once per second."""
+    global _cached_date_time
+    second, date_str, time_str = _cached_date_time
+    current_second = int(time.time())
+    if current_second != second:
+        now = datetime.fromtimestamp(current_second)
+        date_str, time_str = now.strftime("%Y-%m-%d"), now.strftime("%H:%M:%S")
+        _cached_date_time = (current_second, date_str, time_str)
+    return date_str, time_str
 
 
 def get_current_date() -> str:
     """Return current date in YYYY-MM-DD format."""
-    return datetime.now().strftime("%Y-%m-%d")
+    return get_current_date_time()[0]
 
 
 def get_current_time() -> str:
     """Return current time in HH:MM:SS format."""
-    return datetime.now().strftime("%H:%M:%S")
+    return get_current_date_time()[1]
+
+
+_STUDENT_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+_NAME_PATTERN = re.compile(r"[A-Za-z\-' ]+")
 
 
 def validate_student_id(student_id: str) -> Tuple[bool, str]:
@@ -50,7 +157,7 @@ def validate_student_id(student_id: str) -> Tuple[bool, str]:
     if not 3 <= len(cleaned) <= 20:
         return False, "Student ID must be between 3 and 20 characters."
 
-    if not re.fullmatch(r"[A-Za-z0-9_-]+", cleaned):
+    if not _STUDENT_ID_PATTERN.fullmatch(cleaned):
         return False, "Student ID may contain only letters, numbers, hyphens, and underscores."
 
     return True, ""
@@ -65,7 +172,7 @@ def validate_name(name: str) -> Tuple[bool, str]:
     if not 2 <= len(cleaned) <= 100:
         return False, "Name must be between 2 and 100 characters."
 
-    if not re.fullmatch(r"[A-Za-z\-' ]+", cleaned):
+    if not _NAME_PATTERN.fullmatch(cleaned):
         return False, "Name may contain only letters, spaces, hyphens, and apostrophes."
 
     return True, ""
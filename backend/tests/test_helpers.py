@@ -0,0 +1,82 @@
+"""Tests for encoding serialization and image decoding helpers."""
+import io
+import pickle
+import tempfile
+
+import cv2
+import numpy as np
+import pytest
+from bson import Binary
+
+from backend.app.utils.helpers import (
+    binary_to_encoding,
+    binary_to_matrix,
+    encoding_to_binary,
+    image_file_to_rgb,
+    is_legacy_array_binary,
+    matrix_to_binary,
+)
+
+
+def _png_bytes() -> bytes:
+    image = np.zeros((4, 6, 3), dtype=np.uint8)
+    image[..., 0] = 255  # blue in BGR
+    ok, encoded = cv2.imencode(".png", image)
+    assert ok
+    return encoded.tobytes()
+
+
+def test_encoding_round_trip_through_raw_format():
+    encoding = np.random.default_rng(0).uniform(-0.5, 0.5, 128).astype(np.float64)
+
+    binary = encoding_to_binary(encoding)
+    decoded = binary_to_encoding(binary)
+
+    assert not is_legacy_array_binary(binary)
+    assert decoded.dtype == np.float32
+    np.testing.assert_allclose(decoded, encoding, atol=1e-3)
+
+
+def test_legacy_pickled_encoding_decodes_and_migrates():
+    encoding = np.random.default_rng(1).uniform(-0.5, 0.5, 128)
+    legacy = Binary(pickle.dumps(encoding))
+
+    assert is_legacy_array_binary(legacy)
+    decoded = binary_to_encoding(legacy)
+    np.testing.assert_allclose(decoded, encoding, rtol=1e-6)
+
+    migrated = encoding_to_binary(decoded)
+    assert not is_legacy_array_binary(migrated)
+    np.testing.assert_allclose(binary_to_encoding(migrated), encoding, atol=1e-3)
+
+
+def test_matrix_round_trip():
+    matrix = np.random.default_rng(2).uniform(-0.5, 0.5, (3, 128)).astype(np.float32)
+
+    decoded = binary_to_matrix(matrix_to_binary(matrix), matrix.shape)
+
+    assert decoded.dtype == np.float32
+    np.testing.assert_allclose(decoded, matrix, atol=1e-3)
+
+
+@pytest.mark.parametrize("max_size", [1 << 20, 1])
+def test_image_file_to_rgb_decodes_spooled_uploads(max_size):
+    with tempfile.SpooledTemporaryFile(max_size=max_size) as upload:
+        upload.write(_png_bytes())
+
+        rgb = image_file_to_rgb(upload)
+
+    assert rgb.shape == (4, 6, 3)
+    assert rgb[0, 0].tolist() == [0, 0, 255]
+
+
+def test_image_file_to_rgb_decodes_bytesio_from_its_buffer():
+    rgb = image_file_to_rgb(io.BytesIO(_png_bytes()))
+
+    assert rgb.shape == (4, 6, 3)
+    assert rgb[0, 0].tolist() == [0, 0, 255]
+
+
+def test_image_file_to_rgb_rejects_corrupt_data():
+    with pytest.raises(ValueError):
+        image_file_to_rgb(io.BytesIO(b"not an image"))
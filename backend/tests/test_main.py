@@ -0,0 +1,52 @@
+"""Tests for the HTTP endpoints with the database layer mocked out."""
+import logging
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.app import main  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+@pytest.mark.parametrize("path", ["/api/recognize", "/api/attendance/mark"])
+def test_corrupt_upload_is_rejected_with_400(client, path):
+    response = client.post(path, files={"image": ("frame.jpg", b"not an image", "image/jpeg")})
+
+    assert response.status_code == 400
+
+
+def test_health_reports_unreachable_database(client, monkeypatch):
+    monkeypatch.setattr(main._db_service, "ping", MagicMock(return_value=False))
+
+    assert client.get("/api/health").status_code == 503
+
+
+def test_lifespan_logs_warm_up_failure_and_waits_before_close(monkeypatch, caplog):
+    events = []
+
+    def failing_warm_up():
+        time.sleep(0.05)
+        events.append("warm-up")
+        raise RuntimeError("encodings unavailable")
+
+    monkeypatch.setattr(main._db_service, "connect", MagicMock(return_value=True))
+    monkeypatch.setattr(main._db_service, "close", lambda: events.append("close"))
+    monkeypatch.setattr(main, "_warm_up", failing_warm_up)
+
+    with caplog.at_level(logging.ERROR, logger=main.__name__), TestClient(main.app):
+        pass
+
+    assert events == ["warm-up", "close"]
+    assert any(
+        record.message == "Warm-up failed" and record.exc_info[0] is RuntimeError
+        for record in caplog.records
+    )
@@ -0,0 +1,301 @@
+"""Tests for the MongoDB service layer using mocked collections."""
+import dataclasses
+import pickle
+import threading
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from bson import Binary
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from backend.app.services import mongo_service
+from backend.app.services.mongo_service import _ATTENDANCE_PROJECTION, MongoDBService
+from backend.app.utils.helpers import binary_to_encoding, encoding_to_binary, is_legacy_array_binary
+
+
+def _index_keys(collection: MagicMock) -> list:
+    keys = []
+    for call in collection.create_index.call_args_list:
+        spec = call.args[0]
+        keys.append([(spec, 1)] if isinstance(spec, str) else list(spec))
+    return keys
+
+
+def _service_with_mocks() -> MongoDBService:
+    service = MongoDBService()
+    service._students_collection = MagicMock()
+    service._students_collection.estimated_document_count.return_value = 3
+    service._attendance_collection = MagicMock()
+    return service
+
+
+def test_mark_attendance_many_reports_upserts_and_duplicates():
+    service = _service_with_mocks()
+    collection = service._attendance_collection
+    collection.bulk_write.return_value = MagicMock(upserted_ids={0: "new-id"})
+
+    results = service.mark_attendance_many([("S1", "Ada"), ("S2", "Grace")])
+
+    assert results == [
+        (True, "Attendance marked successfully"),
+        (False, "Attendance already marked for today."),
+    ]
+    operations = collection.bulk_write.call_args.args[0]
+    assert all(isinstance(operation, UpdateOne) for operation in operations)
+    assert service._marked_today[1] == {"S1", "S2"}
+
+    collection.bulk_write.reset_mock()
+    assert service.mark_attendance("S1", "Ada") == (False, "Attendance already marked for today.")
+    collection.bulk_write.assert_not_called()
+
+
+def test_mark_attendance_many_keeps_failed_writes_unmarked():
+    service = _service_with_mocks()
+    service._attendance_collection.bulk_write.side_effect = BulkWriteError(
+        {
+            "upserted": [{"index": 0, "_id": "new-id"}],
+            "writeErrors": [{"index": 1, "code": 121, "errmsg": "validation failed"}],
+        }
+    )
+
+    results = service.mark_attendance_many([("S1", "Ada"), ("S2", "Grace")])
+
+    assert results == [
+        (True, "Attendance marked successfully"),
+        (False, "Database connection failed."),
+    ]
+    assert service._marked_today[1] == {"S1"}
+
+
+def test_flush_marks_students_only_after_acknowledged_upsert():
+    service = _service_with_mocks()
+    collection = service._attendance_collection
+    collection.bulk_write.side_effect = PyMongoError("network error")
+
+    service.queue_attendance([("S1", "Ada"), ("S1", "Ada")])
+    service.flush_attendance()
+
+    operations = collection.bulk_write.call_args.args[0]
+    assert len(operations) == 1
+    assert isinstance(operations[0], UpdateOne)
+    assert service._marked_today[1] == set()
+
+    collection.bulk_write.side_effect = None
+    service.queue_attendance([("S1", "Ada")])
+    service.flush_attendance()
+
+    assert service._marked_today[1] == {"S1"}
+    collection.bulk_write.reset_mock()
+    service.queue_attendance([("S1", "Ada")])
+    service.flush_attendance()
+    collection.bulk_write.assert_not_called()
+
+
+def test_flush_counts_existing_records_as_marked():
+    service = _service_with_mocks()
+    service._attendance_collection.bulk_write.side_effect = BulkWriteError(
+        {
+            "writeErrors": [
+                {"index": 0, "code": 11000, "errmsg": "duplicate key"},
+                {"index": 1, "code": 121, "errmsg": "validation failed"},
+            ]
+        }
+    )
+
+    service.queue_attendance([("S1", "Ada"), ("S2", "Grace"), ("S3", "Alan")])
+    service.flush_attendance()
+
+    assert service._marked_today[1] == {"S1", "S3"}
+
+
+def test_queued_attendance_is_flushed_by_the_timer(monkeypatch):
+    monkeypatch.setattr(
+        mongo_service,
+        "DATABASE",
+        dataclasses.replace(mongo_service.DATABASE, ATTENDANCE_FLUSH_INTERVAL_S=0.01),
+    )
+    service = _service_with_mocks()
+
+    service.queue_attendance([("S1", "Ada"), ("S2", "Grace")])
+    timer = service._flush_timer
+    assert timer is not None
+    timer.join(timeout=5)
+
+    operations = service._attendance_collection.bulk_write.call_args.args[0]
+    assert len(operations) == 2
+    assert service._marked_today[1] == {"S1", "S2"}
+    assert service._flush_timer is None
+
+
+def test_daily_summary_hints_existing_index_by_key_document():
+    service = _service_with_mocks()
+    service._create_indexes()
+    service._attendance_collection.aggregate.return_value = iter(
+        [{"_id": "present", "count": 2}, {"_id": "late", "count": 1}]
+    )
+
+    summary = service.get_daily_summary("2024-01-01")
+
+    assert summary == {
+        "total_students": 3,
+        "attendance_count": 3,
+        "by_status": {"present": 2, "late": 1},
+    }
+    pipeline = service._attendance_collection.aggregate.call_args.args[0]
+    options = service._attendance_collection.aggregate.call_args.kwargs
+    assert pipeline[0] == {"$match": {"date": "2024-01-01"}}
+    # aggregate() forwards the hint unconverted, so it must be a key document.
+    assert isinstance(options["hint"], dict)
+    assert list(options["hint"].items()) in _index_keys(service._attendance_collection)
+
+
+def test_attendance_readers_project_and_hint_existing_indexes():
+    service = _service_with_mocks()
+    service._create_indexes()
+    collection = service._attendance_collection
+    record = {"student_id": "S1", "name": "Ada", "date": "2024-01-01"}
+    readers = [
+        (lambda: service.get_attendance_by_date("2024-01-01"), collection.find.return_value.hint),
+        (
+            lambda: service.get_attendance_by_range("2024-01-01", "2024-01-31"),
+            collection.find.return_value.sort.return_value.hint,
+        ),
+        (
+            lambda: service.get_recent_attendance("2024-01-01", 5),
+            collection.find.return_value.sort.return_value.hint,
+        ),
+        (
+            lambda: service.get_student_attendance_history("S1", 5),
+            collection.find.return_value.sort.return_value.hint,
+        ),
+    ]
+    for read, hint in readers:
+        collection.find.return_value.hint.return_value = iter([record])
+        collection.find.return_value.sort.return_value.hint.return_value = iter([record])
+        assert list(read()) == [record]
+        assert collection.find.call_args.kwargs["projection"] == _ATTENDANCE_PROJECTION
+        assert list(hint.call_args.args[0]) in _index_keys(collection)
+
+
+def test_migrate_legacy_encodings_rewrites_only_pickled_blobs():
+    service = _service_with_mocks()
+    service._db = MagicMock()
+    raw_students = service._db.__getitem__.return_value
+    encoding = np.random.default_rng(0).uniform(-0.5, 0.5, 128)
+    raw_students.find.return_value = iter(
+        [
+            {"_id": 1, "face_encoding": Binary(pickle.dumps(encoding))},
+            {"_id": 2, "face_encoding": encoding_to_binary(encoding)},
+        ]
+    )
+
+    assert service.migrate_legacy_encodings() == 1
+
+    (update,) = raw_students.bulk_write.call_args.args[0]
+    assert isinstance(update, UpdateOne)
+    assert update._filter == {"_id": 1}
+    rewritten = update._doc["$set"]["face_encoding"]
+    assert not is_legacy_array_binary(rewritten)
+    np.testing.assert_allclose(binary_to_encoding(rewritten), encoding, atol=1e-3)
+
+
+def test_local_encodings_copy_is_keyed_on_bundle_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        mongo_service,
+        "DATABASE",
+        dataclasses.replace(
+            mongo_service.DATABASE, ENCODINGS_CACHE_PATH=str(tmp_path / "cache.npz")
+        ),
+    )
+    matrix = np.random.default_rng(0).random((2, 128), dtype=np.float32)
+    MongoDBService._save_local_encodings("v1", (matrix, ["S1", "S2"], ["Ada", "Grace"]))
+
+    loaded = MongoDBService._load_local_encodings("v1")
+
+    assert loaded is not None
+    np.testing.assert_array_equal(loaded[0], matrix)
+    assert loaded[1:] == (["S1", "S2"], ["Ada", "Grace"])
+    assert MongoDBService._load_local_encodings("v2") is None
+    assert [path.name for path in tmp_path.iterdir()] == ["cache.npz"]
+
+
+def test_get_db_service_constructs_one_instance_across_threads(monkeypatch):
+    constructed = []
+
+    class SlowService(MongoDBService):
+        def __init__(self) -> None:
+            constructed.append(self)
+            time.sleep(0.01)
+            super().__init__()
+
+    monkeypatch.setattr(mongo_service, "MongoDBService", SlowService)
+    monkeypatch.setattr(mongo_service, "_service_instance", None)
+    barrier = threading.Barrier(8)
+    services = []
+
+    def fetch() -> None:
+        barrier.wait()
+        services.append(mongo_service.get_db_service())
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(constructed) == 1
+    assert services == [constructed[0]] * 8
+
+
+def test_encodings_follow_a_bundle_rebuilt_by_another_worker(tmp_path, monkeypatch):
+    mongomock = pytest.importorskip("mongomock")
+    monkeypatch.setattr(
+        mongo_service,
+        "DATABASE",
+        dataclasses.replace(
+            mongo_service.DATABASE,
+            ENCODINGS_CACHE_PATH=str(tmp_path / "cache.npz"),
+            ENCODINGS_CHECK_TTL_S=0.0,
+        ),
+    )
+    db = mongomock.MongoClient()["face_attendance"]
+
+    def worker() -> MongoDBService:
+        service = MongoDBService()
+        service._db = db
+        service._students_collection = db["students"]
+        service._attendance_collection = db["attendance"]
+        service._encodings_bundle_collection = db["face_encodings_bundle"]
+        return service
+
+    first, second = worker(), worker()
+    first.add_student({"student_id": "S1", "name": "Ada", "face_encoding": [0.1] * 128})
+    assert second.get_face_encoding_matrix()[1] == ["S1"]
+    stale_version = second.get_encodings_version()
+
+    first.add_student({"student_id": "S2", "name": "Grace", "face_encoding": [0.2] * 128})
+
+    assert second.get_face_encoding_matrix()[1] == ["S1", "S2"]
+    assert second.get_encodings_version() == first.get_encodings_version() != stale_version
+
+
+def test_mark_attendance_many_updates_marked_set_under_pending_lock():
+    service = _service_with_mocks()
+    service._attendance_collection.bulk_write.return_value = MagicMock(upserted_ids={0: "new-id"})
+    results = []
+
+    with service._pending_lock:
+        thread = threading.Thread(
+            target=lambda: results.extend(service.mark_attendance_many([("S1", "Ada")]))
+        )
+        thread.start()
+        thread.join(0.05)
+        assert thread.is_alive()
+        assert results == []
+    thread.join()
+
+    assert results == [(True, "Attendance marked successfully")]
+    assert service._marked_today[1] == {"S1"}
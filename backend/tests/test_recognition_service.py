@@ -0,0 +1,89 @@
+"""Tests for face detection and matching in the recognition service."""
+import numpy as np
+import pytest
+
+face_recognition = pytest.importorskip("face_recognition")
+
+from backend.app.services import recognition_service  # noqa: E402
+from backend.app.services.recognition_service import FaceRecognitionService  # noqa: E402
+
+
+def _service_with_known_faces(matrix: np.ndarray) -> FaceRecognitionService:
+    service = FaceRecognitionService()
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    ids = [f"S{index}" for index in range(len(matrix))]
+    names = [f"Student {index}" for index in range(len(matrix))]
+    service._known_faces = (matrix, np.einsum("ij,ij->i", matrix, matrix), ids, names)
+    return service
+
+
+def test_match_faces_agrees_with_face_distance():
+    rng = np.random.default_rng(0)
+    known = rng.normal(0.0, 0.1, (5, 128))
+    service = _service_with_known_faces(known)
+    matching = known[3] + rng.normal(0.0, 0.01, 128)
+    stranger = known[1] + 2.0
+    locations = [(0, 10, 10, 0), (20, 30, 30, 20)]
+
+    results = service._match_faces([matching, stranger], locations)
+
+    distances = face_recognition.face_distance(known.astype(np.float32), matching)
+    assert results[0].is_match
+    assert results[0].student_id == "S3"
+    assert results[0].name == "Student 3"
+    assert results[0].location == locations[0]
+    assert results[0].confidence == pytest.approx(1.0 - distances.min(), abs=1e-4)
+
+    assert min(face_recognition.face_distance(known, stranger)) >= service._tolerance
+    assert not results[1].is_match
+    assert results[1].student_id is None
+    assert results[1].location == locations[1]
+
+
+def test_match_faces_without_known_faces_is_unknown():
+    service = FaceRecognitionService()
+
+    results = service._match_faces([np.zeros(128)], [(0, 10, 10, 0)])
+
+    assert [(result.student_id, result.is_match) for result in results] == [(None, False)]
+
+
+def test_locate_faces_rescales_and_clamps_boxes(monkeypatch):
+    seen_shapes = []
+
+    def fake_face_locations(image, **kwargs):
+        seen_shapes.append(image.shape[:2])
+        return [(10, 200, 150, 60), (0, 330, 10, 320), (-5, 645, 200, 500)]
+
+    monkeypatch.setattr(face_recognition, "face_locations", fake_face_locations)
+    frame = np.zeros((960, 1280, 3), dtype=np.uint8)
+
+    locations = FaceRecognitionService._locate_faces(frame)
+
+    assert seen_shapes == [(480, 640)]
+    assert locations == [(20, 400, 300, 120), (0, 1280, 400, 1000)]
+
+
+def test_locate_faces_keeps_small_frames_at_full_resolution(monkeypatch):
+    seen_shapes = []
+
+    def fake_face_locations(image, **kwargs):
+        seen_shapes.append(image.shape[:2])
+        return [(10, 90, 90, 10)]
+
+    monkeypatch.setattr(face_recognition, "face_locations", fake_face_locations)
+
+    locations = FaceRecognitionService._locate_faces(np.zeros((240, 320, 3), dtype=np.uint8))
+
+    assert seen_shapes == [(240, 320)]
+    assert locations == [(10, 90, 90, 10)]
+
+
+@pytest.mark.parametrize(
+    "model, cuda, expected",
+    [("auto", True, "cnn"), ("auto", False, "hog"), ("hog", True, "hog"), ("cnn", False, "cnn")],
+)
+def test_detection_model_uses_cnn_only_when_configured(monkeypatch, model, cuda, expected):
+    monkeypatch.setattr(recognition_service.dlib, "DLIB_USE_CUDA", cuda)
+
+    assert recognition_service._resolve_detection_model(model) == expected
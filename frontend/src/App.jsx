@@ -1,8 +1,5 @@
-import React, { useEffect, useState } from "react";
+import React, { Suspense, lazy, useEffect, useState } from "react";
 import DashboardView from "./views/DashboardView.jsx";
-import RegisterView from "./views/RegisterView.jsx";
-import AttendanceView from "./views/AttendanceView.jsx";
-import RecordsView from "./views/RecordsView.jsx";
 import AuthView from "./views/AuthView.jsx";
 import HomeView from "./views/HomeView.jsx";
 import RoleSetupView from "./views/RoleSetupView.jsx";
@@ -14,6 +11,10 @@ import { signOutUser } from "./services/auth.js";
 import { getUserProfile } from "./services/user.js";
 import { getCommunityById } from "./services/community.js";
 
+const RegisterView = lazy(() => import("./views/RegisterView.jsx"));
+const AttendanceView = lazy(() => import("./views/AttendanceView.jsx"));
+const RecordsView = lazy(() => import("./views/RecordsView.jsx"));
+
 const VIEWS = [
   { key: "dashboard", label: "Dashboard" },
   { key: "register", label: "Register" },
@@ -174,10 +175,12 @@ export default function App() {
           </div>
         </header>
         <section className="content-area">
-          {activeView === "dashboard" && <DashboardView />}
-          {activeView === "register" && <RegisterView />}
-          {activeView === "attendance" && <AttendanceView />}
-          {activeView === "records" && <RecordsView />}
+          <Suspense fallback={<div className="notice">Loading...</div>}>
+            {activeView === "dashboard" && <DashboardView />}
+            {activeView === "register" && <RegisterView />}
+            {activeView === "attendance" && <AttendanceView />}
+            {activeView === "records" && <RecordsView />}
+          </Suspense>
         </section>
       </main>
     </div>
@@ -25,11 +25,19 @@ export async function fetchStudents() {
   return apiGet("/students");
 }
 
+export async function fetchStats() {
+  return apiGet("/stats");
+}
+
 export async function fetchAttendance(date) {
   const query = date ? `?date=${date}` : "";
   return apiGet(`/attendance${query}`);
 }
 
+export async function fetchRecentAttendance(limit) {
+  return apiGet(`/attendance/recent?limit=${limit}`);
+}
+
 export async function fetchAttendanceRange(start, end) {
   return apiGet(`/attendance?start=${start}&end=${end}`);
 }
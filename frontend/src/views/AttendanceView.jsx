@@ -1,13 +1,24 @@
-import React, { useRef, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import { recognizeAndMark } from "../services/api.js";
 
+const MAX_CAPTURE_WIDTH = 640;
+const RECOGNITION_INTERVAL_MS = 2000;
+
 export default function AttendanceView() {
   const videoRef = useRef(null);
   const canvasRef = useRef(null);
+  const contextRef = useRef(null);
+  const inFlightRef = useRef(false);
   const [status, setStatus] = useState("Idle");
   const [log, setLog] = useState([]);
   const [intervalId, setIntervalId] = useState(null);
 
+  useEffect(() => () => {
+    if (intervalId) {
+      clearInterval(intervalId);
+    }
+  }, [intervalId]);
+
   const startCamera = async () => {
     try {
       const stream = await navigator.mediaDevices.getUserMedia({ video: true });
@@ -32,16 +43,28 @@ export default function AttendanceView() {
   const captureAndRecognize = async () => {
     const video = videoRef.current;
     const canvas = canvasRef.current;
-    if (!video || !canvas) {
+    if (!video || !canvas || inFlightRef.current || document.hidden) {
       return;
     }
-    const context = canvas.getContext("2d");
-    canvas.width = video.videoWidth || 640;
-    canvas.height = video.videoHeight || 480;
+    inFlightRef.current = true;
+    if (!contextRef.current) {
+      contextRef.current = canvas.getContext("2d", { alpha: false });
+    }
+    const context = contextRef.current;
+    const sourceWidth = video.videoWidth || 640;
+    const sourceHeight = video.videoHeight || 480;
+    const scale = Math.min(1, MAX_CAPTURE_WIDTH / sourceWidth);
+    const width = Math.round(sourceWidth * scale);
+    const height = Math.round(sourceHeight * scale);
+    if (canvas.width !== width || canvas.height !== height) {
+      canvas.width = width;
+      canvas.height = height;
+    }
     context.drawImage(video, 0, 0, canvas.width, canvas.height);
 
     canvas.toBlob(async (blob) => {
       if (!blob) {
+        inFlightRef.current = false;
         return;
       }
       const formData = new FormData();
@@ -60,6 +83,8 @@ export default function AttendanceView() {
         setStatus("Recognition cycle complete");
       } catch (error) {
         setStatus(error.message || "Recognition failed");
+      } finally {
+        inFlightRef.current = false;
       }
     }, "image/jpeg");
   };
@@ -69,7 +94,7 @@ export default function AttendanceView() {
       return;
     }
     captureAndRecognize();
-    const id = setInterval(captureAndRecognize, 2000);
+    const id = setInterval(captureAndRecognize, RECOGNITION_INTERVAL_MS);
     setIntervalId(id);
     setStatus("Recognition running");
   };
@@ -1,9 +1,5 @@
 import React, { useEffect, useState } from "react";
-import { fetchAttendance, fetchStudents } from "../services/api.js";
-
-function getTodayDate() {
-  return new Date().toISOString().split("T")[0];
-}
+import { fetchRecentAttendance, fetchStats } from "../services/api.js";
 
 export default function DashboardView() {
   const [stats, setStats] = useState({
@@ -17,16 +13,16 @@ export default function DashboardView() {
   useEffect(() => {
     async function loadData() {
       try {
-        const [students, attendance] = await Promise.all([
-          fetchStudents(),
-          fetchAttendance(getTodayDate())
+        const [summary, recentRecords] = await Promise.all([
+          fetchStats(),
+          fetchRecentAttendance(8)
         ]);
-        const total = students.length;
-        const present = attendance.length;
+        const total = summary.total_students;
+        const present = summary.present_today;
         const rate = total > 0 ? ((present / total) * 100).toFixed(1) : 0;
         const pending = Math.max(total - present, 0);
         setStats({ total, present, rate, pending });
-        setRecent(attendance.slice(0, 8));
+        setRecent(recentRecords);
       } catch (error) {
         console.error(error);
       }
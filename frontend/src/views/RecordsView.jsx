@@ -1,23 +1,42 @@
-import React, { useState } from "react";
+import React, { useRef, useState } from "react";
 import { fetchAttendanceRange } from "../services/api.js";
 
+const PAGE_SIZE = 200;
+
 function formatDate(date) {
   return date.toISOString().split("T")[0];
 }
 
 export default function RecordsView() {
-  const [startDate, setStartDate] = useState(formatDate(new Date()));
-  const [endDate, setEndDate] = useState(formatDate(new Date()));
+  const [today] = useState(() => formatDate(new Date()));
+  const [startDate, setStartDate] = useState(today);
+  const [endDate, setEndDate] = useState(today);
   const [records, setRecords] = useState([]);
+  const [visibleCount, setVisibleCount] = useState(PAGE_SIZE);
   const [status, setStatus] = useState("Ready");
+  const loadingRef = useRef(false);
+  const loadedRangeRef = useRef("");
 
   const handleSearch = async () => {
+    if (loadingRef.current) {
+      return;
+    }
+    const range = `${startDate}|${endDate}`;
+    if (loadedRangeRef.current === range && endDate < today) {
+      setStatus(`Loaded ${records.length} records`);
+      return;
+    }
+    loadingRef.current = true;
     try {
       const data = await fetchAttendanceRange(startDate, endDate);
       setRecords(data);
+      setVisibleCount(PAGE_SIZE);
+      loadedRangeRef.current = range;
       setStatus(`Loaded ${data.length} records`);
     } catch (error) {
       setStatus(error.message || "Failed to load records");
+    } finally {
+      loadingRef.current = false;
     }
   };
 
@@ -47,7 +66,7 @@ export default function RecordsView() {
           </tr>
         </thead>
         <tbody>
-          {records.map((record, index) => (
+          {records.slice(0, visibleCount).map((record, index) => (
             <tr key={`${record.student_id}-${index}`}>
               <td>{record.date}</td>
               <td>{record.time}</td>
@@ -58,6 +77,11 @@ export default function RecordsView() {
           ))}
         </tbody>
       </table>
+      {records.length > visibleCount && (
+        <button className="button" onClick={() => setVisibleCount((count) => count + PAGE_SIZE)}>
+          Show more ({records.length - visibleCount} remaining)
+        </button>
+      )}
       {records.length === 0 && <div className="notice">No records found for this range.</div>}
     </div>
   );